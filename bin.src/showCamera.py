@@ -21,13 +21,12 @@
 # see <http://www.lsstcorp.org/LegalNotices/>.
 #
 import sys
-import matplotlib.pyplot as plt
 
-import lsst.afw.cameraGeom.utils as cameraGeomUtils
 from lsst.log import Log
 
 if __name__ == '__main__':
     import argparse
+    import importlib
 
     parser = argparse.ArgumentParser(description='Show the layout of CCDs in a camera.',
                                      epilog='The corresponding obs-package must be setup (e.g. obs_decam '
@@ -48,20 +47,17 @@ if __name__ == '__main__':
     obsPackageName = f"lsst.obs.{args.mapper}"  # guess the package
 
     try:
-        __import__(obsPackageName)
-    except Exception:
+        obsPackage = importlib.import_module(obsPackageName)
+    except ImportError:
         print(f"Unable to import {obsPackageName} -- is it setup?", file=sys.stderr)
         sys.exit(1)
 
-    # __import__ returns the top-level module, so look ours up
-    obsPackage = sys.modules[obsPackageName]
-
     # Guess the name too.
     mapperName = f"{args.mapper[0].title()}{args.mapper[1:]}Mapper"
     try:
         mapper = getattr(obsPackage, mapperName)
     except AttributeError:
-        print("Unable to find mapper {mapperName} in {obsPackageName}", file=sys.stderr)
+        print(f"Unable to find mapper {mapperName} in {obsPackageName}", file=sys.stderr)
         sys.exit(1)
     #
     # Control verbosity from butler
@@ -69,8 +65,12 @@ if __name__ == '__main__':
     log = Log.getLogger("CameraMapper")
     log.setLevel(Log.FATAL)
     #
-    # And finally find the camera
+    # And finally find the camera; defer the matplotlib-heavy imports until
+    # the arguments and obs package have been validated
     #
+    import matplotlib.pyplot as plt
+    import lsst.afw.cameraGeom.utils as cameraGeomUtils
+
     camera = mapper().camera
 
     if not args.outputFile:
@@ -312,7 +312,8 @@ def makeImageFromCcd(ccd, isTrimmed=True, showAmpGain=True, imageFactory=afwImag
             raise RuntimeError(
                 "Cannot create untrimmed CCD without amps with raw information")
         ccdImage = imageFactory(ccd.getBBox())
-    ccdImage = afwMath.binImage(ccdImage, binSize)
+    if binSize > 1:
+        ccdImage = afwMath.binImage(ccdImage, binSize)
     return ccdImage
 
 
@@ -493,8 +494,6 @@ class ButlerImage(FakeImageDataSource):
         if self.type == "raw":
             if hasattr(im, 'convertF'):
                 im = im.convertF()
-            if False and self.callback is None:   # we need to trim the raw image
-                self.callback = rawCallback
 
         allowRotate = True
         if self.callback:
@@ -651,27 +650,10 @@ def overlayCcdBoxes(ccd, untrimmedCcdBbox=None, nQuarter=0,
                         bbox = rotateBBoxBy90(bbox, nQuarter, ccdDim)
                     displayUtils.drawBBox(bbox, origin=ccdOrigin, borderWidth=0.49, ctype=ctype,
                                           display=display, bin=binSize)
-            # Label each Amp
+            # Label each Amp; the amp bbox has already been rotated, so only
+            # the text needs to be turned through nQuarter*90 degrees
             xc, yc = ((ampbbox.getMin()[0] + ampbbox.getMax()[0])//2,
                       (ampbbox.getMin()[1] + ampbbox.getMax()[1])//2)
-            #
-            # Rotate the amp labels too
-            #
-            if nQuarter == 0:
-                c, s = 1, 0
-            elif nQuarter == 1:
-                c, s = 0, -1
-            elif nQuarter == 2:
-                c, s = -1, 0
-            elif nQuarter == 3:
-                c, s = 0, 1
-            c, s = 1, 0
-            ccdHeight = ccdBbox.getHeight()
-            ccdWidth = ccdBbox.getWidth()
-            xc -= 0.5*ccdHeight
-            yc -= 0.5*ccdWidth
-
-            xc, yc = 0.5*ccdHeight + c*xc + s*yc, 0.5*ccdWidth + -s*xc + c*yc
 
             if ccdOrigin:
                 xc += ccdOrigin[0]
@@ -802,6 +784,11 @@ def getCcdInCamBBoxList(ccdList, binSize, pixelSize_o, origin):
     boxList : `list` [`lsst.geom.Box2I`]
         A list of bounding boxes in camera pixel coordinates.
     """
+    # The shift to the camera pixel grid origin is the same for every Detector
+    originShift = lsst.geom.Extent2I(-int(origin.getX()//binSize),
+                                     -int(origin.getY())//binSize)
+    pixelSizeX, pixelSizeY = pixelSize_o.getX(), pixelSize_o.getY()
+
     boxList = []
     for ccd in ccdList:
         if not pixelSize_o == ccd.getPixelSize():
@@ -819,10 +806,9 @@ def getCcdInCamBBoxList(ccdList, binSize, pixelSize_o, origin):
         bbox = lsst.geom.Box2I(
             cbbox.getMin(), lsst.geom.Extent2I(int(ex), int(ey)))
         bbox = rotateBBoxBy90(bbox, nQuarter, bbox.getDimensions())
-        bbox.shift(lsst.geom.Extent2I(int(llc.getX()//pixelSize_o.getX()/binSize),
-                                      int(llc.getY()//pixelSize_o.getY()/binSize)))
-        bbox.shift(lsst.geom.Extent2I(-int(origin.getX()//binSize),
-                                      -int(origin.getY())//binSize))
+        bbox.shift(lsst.geom.Extent2I(int(llc.getX()//pixelSizeX/binSize),
+                                      int(llc.getY()//pixelSizeY/binSize)))
+        bbox.shift(originShift)
         boxList.append(bbox)
     return boxList
 
@@ -315,7 +315,7 @@ def imagesDiffer(image0, image1, skipMask=None, rtol=1.0e-05, atol=1e-08):
             np.promote_types(imageArr1.dtype, np.int8))
 
     if skipMaskArr is not None:
-        skipMaskArr = np.array(skipMaskArr, dtype=bool)
+        skipMaskArr = np.asarray(skipMaskArr, dtype=bool)
         maskedArr0 = np.ma.array(imageArr0, copy=False, mask=skipMaskArr)
         maskedArr1 = np.ma.array(imageArr1, copy=False, mask=skipMaskArr)
         filledArr0 = maskedArr0.filled(0.0)
@@ -22,19 +22,25 @@
 """
 Tests for lsst.afw.cameraGeom.CameraSys and CameraSysPrefix
 """
+import itertools
 import unittest
 
+import numpy as np
+
 import lsst.utils.tests
 import lsst.afw.cameraGeom as cameraGeom
 
 
 class CameraSysTestCase(unittest.TestCase):
+    sysNames = ("fieldAngle", "pixels")
+    detectorNames = ("", "det1", "det2")
+    keys = list(itertools.product(sysNames, detectorNames))
 
     def testBasics(self):
         """Test CameraSys and CameraSysPrefix
         """
-        for sysName in ("fieldAngle", "pixels"):
-            for detectorName in ("", "det1", "det2"):
+        for sysName in self.sysNames:
+            for detectorName in self.detectorNames:
                 cameraSys = cameraGeom.CameraSys(sysName, detectorName)
                 self.assertEqual(cameraSys.getSysName(), sysName)
                 self.assertEqual(cameraSys.getDetectorName(), detectorName)
@@ -67,25 +73,19 @@ class CameraSysTestCase(unittest.TestCase):
                 self.assertFalse(cameraSys == camSysPrefix)
                 self.assertFalse(noDetSys == camSysPrefix)
 
-            for sysName2 in ("fieldAngle", "pixels"):
-                for detectorName2 in ("", "det1", "det2"):
-                    cameraSys2 = cameraGeom.CameraSys(sysName2, detectorName2)
-                    if sysName == sysName2 and detectorName == detectorName2:
-                        self.assertEqual(cameraSys, cameraSys2)
-                        # test __eq__ and __ne__
-                        self.assertTrue(cameraSys == cameraSys2)
-                        self.assertFalse(cameraSys != cameraSys2)
-                    else:
-                        self.assertNotEqual(cameraSys, cameraSys2)
-                        # test __eq__ and __ne__
-                        self.assertTrue(cameraSys != cameraSys2)
-                        self.assertFalse(cameraSys == cameraSys2)
-
-                    camSysPrefix2 = cameraGeom.CameraSysPrefix(sysName2)
-                    if sysName2 == sysName:
-                        self.assertEqual(camSysPrefix2, camSysPrefix)
-                    else:
-                        self.assertNotEqual(camSysPrefix2, camSysPrefix)
+        # Compare every pair of CameraSys and of CameraSysPrefix; the names
+        # are distinct, so only the diagonal should compare equal. These are
+        # checking the functionality of the == and != operators and should
+        # not be replaced with assertEqual or assertNotEqual
+        systems = [cameraGeom.CameraSys(*key) for key in self.keys]
+        truth = np.identity(len(self.keys), dtype=bool)
+        np.testing.assert_array_equal([[cs1 == cs2 for cs2 in systems] for cs1 in systems], truth)
+        np.testing.assert_array_equal([[cs1 != cs2 for cs2 in systems] for cs1 in systems], ~truth)
+
+        prefixes = [cameraGeom.CameraSysPrefix(sysName) for sysName in self.sysNames]
+        truth = np.identity(len(self.sysNames), dtype=bool)
+        np.testing.assert_array_equal([[p1 == p2 for p2 in prefixes] for p1 in prefixes], truth)
+        np.testing.assert_array_equal([[p1 != p2 for p2 in prefixes] for p1 in prefixes], ~truth)
 
     def testRepr(self):
         """Test __repr__
@@ -103,12 +103,10 @@ class CameraSysTestCase(unittest.TestCase):
         """Test that hashing gives equal CameraSys equal hashes"""
         # Not sure CameraSys has diverse enough values for testing
         # hash uniformity to be worthwhile
-        cs1 = cameraGeom.CameraSys("pixels", "det1")
-        cs1Copy = cameraGeom.CameraSys("pixels", "det1")
-        cs2 = cameraGeom.CameraSys("pixels", "det2")
-        cs2Copy = cameraGeom.CameraSys("pixels", "det2")
-        csSet = set((cs1, cs1Copy, cs2, cs2Copy))
-        self.assertEqual(len(csSet), 2)
+        csList = [cameraGeom.CameraSys(*key) for key in self.keys]
+        csCopyList = [cameraGeom.CameraSys(*key) for key in self.keys]
+        csSet = set(csList + csCopyList)
+        self.assertEqual(len(csSet), len(self.keys))
 
 
 class MemoryTester(lsst.utils.tests.MemoryTestCase):
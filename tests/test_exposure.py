@@ -23,6 +23,7 @@
 Test lsst.afw.image.Exposure
 """
 
+import functools
 import os.path
 import unittest
 
@@ -38,7 +39,7 @@ from lsst.afw.coord import Weather
 import lsst.afw.geom as afwGeom
 import lsst.afw.table as afwTable
 import lsst.pex.exceptions as pexExcept
-from lsst.afw.fits import readMetadata, FitsError
+from lsst.afw.fits import readMetadata, FitsError, MemFileManager
 from lsst.afw.cameraGeom.testUtils import DetectorWrapper
 from lsst.log import Log
 from testTableArchivesLib import DummyPsf
@@ -67,44 +68,83 @@ class ExposureTestCase(lsst.utils.tests.TestCase):
     A test case for the Exposure Class
     """
 
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # Read the small fixture once; tests get their own deep copies
+        cls._maskedImageSmall = afwImage.MaskedImageF(inFilePathSmall)
+        cls._mdSmall = readMetadata(inFilePathSmall)
+        cls._exposureSmall = afwImage.ExposureF(inFilePathSmall)
+        # The cutout test positions only depend on the fixture's WCS
+        wcs = cls._exposureSmall.getWcs()
+        cls._cutoutLocations = [
+            ("center", wcs.pixelToSky(lsst.geom.Box2D(cls._exposureSmall.getBBox()).getCenter())),
+            ("edge", wcs.pixelToSky(lsst.geom.Point2D(0, 0))),
+            ("rounding test", wcs.pixelToSky(lsst.geom.Point2D(0.2, 0.7))),
+            ("just inside", wcs.pixelToSky(lsst.geom.Point2D(-0.5 + 1e-4, -0.5 + 1e-4))),
+            ("just outside", wcs.pixelToSky(lsst.geom.Point2D(-0.5 - 1e-4, -0.5 - 1e-4))),
+            ("outside", wcs.pixelToSky(lsst.geom.Point2D(-1000, -1000)))]
+        cls.gFilterLabel = afwImage.FilterLabel(band="g")
+        # Detectors are immutable, so one can be shared by all tests
+        cls.detector = DetectorWrapper().detector
+
+    @classmethod
+    def tearDownClass(cls):
+        del cls._maskedImageSmall
+        del cls._mdSmall
+        del cls._exposureSmall
+        del cls._cutoutLocations
+        del cls.gFilterLabel
+        del cls.detector
+        super().tearDownClass()
+
+    def _readMaskedImageSmall(self):
+        """Return a deep copy of the MaskedImage read from small_MI.fits"""
+        return afwImage.MaskedImageF(self._maskedImageSmall, True)
+
     def setUp(self):
-        maskedImage = afwImage.MaskedImageF(inFilePathSmall)
-        maskedImageMD = readMetadata(inFilePathSmall)
+        maskedImage = self._readMaskedImageSmall()
+        maskedImageMD = self._mdSmall.deepCopy()
 
-        self.smallExposure = afwImage.ExposureF(inFilePathSmall)
+        self.smallExposure = afwImage.ExposureF(self._exposureSmall, True)
         self.width = maskedImage.getWidth()
         self.height = maskedImage.getHeight()
         self.wcs = afwGeom.makeSkyWcs(maskedImageMD, False)
         self.md = maskedImageMD
         self.psf = DummyPsf(2.0)
-        self.detector = DetectorWrapper().detector
         self.extras = {"MISC": DummyPsf(3.5)}
 
         self.exposureBlank = afwImage.ExposureF()
         self.exposureMiOnly = afwImage.makeExposure(maskedImage)
         self.exposureMiWcs = afwImage.makeExposure(maskedImage, self.wcs)
-        # n.b. the (100, 100, ...) form
-        self.exposureCrWcs = afwImage.ExposureF(100, 100, self.wcs)
-        # test with ExtentI(100, 100) too
-        self.exposureCrOnly = afwImage.ExposureF(lsst.geom.ExtentI(100, 100))
 
         afwImage.Filter.reset()
         afwImage.FilterProperty.reset()
 
         defineFilter("g", 470.0)
+        # Filter depends on the registry reset above, so can't be shared
+        # between tests like gFilterLabel
+        self.gFilter = afwImage.Filter("g")
+
+    # The 100x100 exposures are only needed by a few tests, so build them
+    # on first use rather than in every setUp
+    @functools.cached_property
+    def exposureCrWcs(self):
+        # n.b. the (100, 100, ...) form
+        return afwImage.ExposureF(100, 100, self.wcs)
 
-    def tearDown(self):
-        del self.smallExposure
-        del self.wcs
-        del self.psf
-        del self.detector
-        del self.extras
+    @functools.cached_property
+    def exposureCrOnly(self):
+        # test with ExtentI(100, 100) too
+        return afwImage.ExposureF(lsst.geom.ExtentI(100, 100))
 
-        del self.exposureBlank
-        del self.exposureMiOnly
-        del self.exposureMiWcs
-        del self.exposureCrWcs
-        del self.exposureCrOnly
+    def _makeExposureInfoWithFilters(self):
+        """Return an ExposureInfo with the test Detector and g-band filter."""
+        exposureInfo = afwImage.ExposureInfo()
+        exposureInfo.setDetector(self.detector)
+        exposureInfo.setFilter(self.gFilter)
+        exposureInfo.setFilterLabel(self.gFilterLabel)
+        return exposureInfo
 
     def testGetMaskedImage(self):
         """
@@ -117,67 +157,58 @@ class ExposureTestCase(lsst.utils.tests.TestCase):
         obtained.
         """
         maskedImageBlank = self.exposureBlank.getMaskedImage()
-        blankWidth = maskedImageBlank.getWidth()
-        blankHeight = maskedImageBlank.getHeight()
-        if blankWidth != blankHeight != 0:
-            self.fail(f"{blankWidth} = {blankHeight} != 0")
+        self.assertEqual(maskedImageBlank.getDimensions(), lsst.geom.Extent2I(0, 0))
 
         maskedImageMiOnly = self.exposureMiOnly.getMaskedImage()
-        miOnlyWidth = maskedImageMiOnly.getWidth()
-        miOnlyHeight = maskedImageMiOnly.getHeight()
-        self.assertAlmostEqual(miOnlyWidth, self.width)
-        self.assertAlmostEqual(miOnlyHeight, self.height)
+        self.assertEqual(maskedImageMiOnly.getDimensions(), lsst.geom.Extent2I(self.width, self.height))
 
         # NOTE: Unittests for Exposures created from a MaskedImage and
         # a WCS object are incomplete.  No way to test the validity of
         # the WCS being copied/created.
 
         maskedImageMiWcs = self.exposureMiWcs.getMaskedImage()
-        miWcsWidth = maskedImageMiWcs.getWidth()
-        miWcsHeight = maskedImageMiWcs.getHeight()
-        self.assertAlmostEqual(miWcsWidth, self.width)
-        self.assertAlmostEqual(miWcsHeight, self.height)
+        self.assertEqual(maskedImageMiWcs.getDimensions(), lsst.geom.Extent2I(self.width, self.height))
 
         maskedImageCrWcs = self.exposureCrWcs.getMaskedImage()
-        crWcsWidth = maskedImageCrWcs.getWidth()
-        crWcsHeight = maskedImageCrWcs.getHeight()
-        if crWcsWidth != crWcsHeight != 0:
-            self.fail(f"{crWcsWidth} != {crWcsHeight} != 0")
+        self.assertEqual(maskedImageCrWcs.getDimensions(), lsst.geom.Extent2I(100, 100))
 
         maskedImageCrOnly = self.exposureCrOnly.getMaskedImage()
-        crOnlyWidth = maskedImageCrOnly.getWidth()
-        crOnlyHeight = maskedImageCrOnly.getHeight()
-        if crOnlyWidth != crOnlyHeight != 0:
-            self.fail(f"{crOnlyWidth} != {crOnlyHeight} != 0")
+        self.assertEqual(maskedImageCrOnly.getDimensions(), lsst.geom.Extent2I(100, 100))
 
         # Check Exposure.getWidth() returns the MaskedImage's width
-        self.assertEqual(crOnlyWidth, self.exposureCrOnly.getWidth())
-        self.assertEqual(crOnlyHeight, self.exposureCrOnly.getHeight())
+        self.assertEqual(maskedImageCrOnly.getWidth(), self.exposureCrOnly.getWidth())
+        self.assertEqual(maskedImageCrOnly.getHeight(), self.exposureCrOnly.getHeight())
 
     def testProperties(self):
-        self.assertMaskedImagesEqual(self.exposureMiOnly.maskedImage,
-                                     self.exposureMiOnly.getMaskedImage())
+        # The property and the getter return views of the same pixels, so
+        # check that rather than comparing every pixel
+        miProperty = self.exposureMiOnly.maskedImage
+        miGetter = self.exposureMiOnly.getMaskedImage()
+        self.assertEqual(miProperty.getBBox(), miGetter.getBBox())
+        for plane in ("image", "mask", "variance"):
+            self.assertEqual(getattr(miProperty, plane).array.ctypes.data,
+                             getattr(miGetter, plane).array.ctypes.data)
         mi2 = afwImage.MaskedImageF(self.exposureMiOnly.getDimensions())
-        mi2.image.array[:] = 5.0
-        mi2.variance.array[:] = 3.0
-        mi2.mask.array[:] = 0x1
+        mi2.image.array.fill(5.0)
+        mi2.variance.array.fill(3.0)
+        mi2.mask.array.fill(0x1)
         self.exposureMiOnly.maskedImage = mi2
         self.assertMaskedImagesEqual(self.exposureMiOnly.maskedImage, mi2)
         self.assertImagesEqual(self.exposureMiOnly.image,
                                self.exposureMiOnly.maskedImage.image)
 
         image3 = afwImage.ImageF(self.exposureMiOnly.getDimensions())
-        image3.array[:] = 3.0
+        image3.array.fill(3.0)
         self.exposureMiOnly.image = image3
         self.assertImagesEqual(self.exposureMiOnly.image, image3)
 
         mask3 = afwImage.MaskX(self.exposureMiOnly.getDimensions())
-        mask3.array[:] = 0x2
+        mask3.array.fill(0x2)
         self.exposureMiOnly.mask = mask3
         self.assertMasksEqual(self.exposureMiOnly.mask, mask3)
 
         var3 = afwImage.ImageF(self.exposureMiOnly.getDimensions())
-        var3.array[:] = 2.0
+        var3.array.fill(2.0)
         self.exposureMiOnly.variance = var3
         self.assertImagesEqual(self.exposureMiOnly.variance, var3)
 
@@ -196,14 +227,9 @@ class ExposureTestCase(lsst.utils.tests.TestCase):
 
     def testExposureInfoConstructor(self):
         """Test the Exposure(maskedImage, exposureInfo) constructor"""
-        exposureInfo = afwImage.ExposureInfo()
+        exposureInfo = self._makeExposureInfoWithFilters()
         exposureInfo.setWcs(self.wcs)
-        exposureInfo.setDetector(self.detector)
-        gFilter = afwImage.Filter("g")
-        gFilterLabel = afwImage.FilterLabel(band="g")
-        exposureInfo.setFilter(gFilter)
-        exposureInfo.setFilterLabel(gFilterLabel)
-        maskedImage = afwImage.MaskedImageF(inFilePathSmall)
+        maskedImage = self._readMaskedImageSmall()
         exposure = afwImage.ExposureF(maskedImage, exposureInfo)
 
         self.assertTrue(exposure.hasWcs())
@@ -213,8 +239,8 @@ class ExposureTestCase(lsst.utils.tests.TestCase):
                          self.detector.getName())
         self.assertEqual(exposure.getDetector().getSerial(),
                          self.detector.getSerial())
-        self.assertEqual(exposure.getFilter(), gFilter)
-        self.assertEqual(exposure.getFilterLabel(), gFilterLabel)
+        self.assertEqual(exposure.getFilter(), self.gFilter)
+        self.assertEqual(exposure.getFilterLabel(), self.gFilterLabel)
 
         self.assertTrue(exposure.getInfo().hasWcs())
         self.assertEqual(exposure.getInfo().getWcs().getPixelOrigin(),
@@ -223,8 +249,8 @@ class ExposureTestCase(lsst.utils.tests.TestCase):
                          self.detector.getName())
         self.assertEqual(exposure.getInfo().getDetector().getSerial(),
                          self.detector.getSerial())
-        self.assertEqual(exposure.getInfo().getFilter(), gFilter)
-        self.assertEqual(exposure.getInfo().getFilterLabel(), gFilterLabel)
+        self.assertEqual(exposure.getInfo().getFilter(), self.gFilter)
+        self.assertEqual(exposure.getInfo().getFilterLabel(), self.gFilterLabel)
 
     def testNullWcs(self):
         """Test that an Exposure constructed with second argument None is usable
@@ -251,14 +277,9 @@ class ExposureTestCase(lsst.utils.tests.TestCase):
             exposureInfo.setComponent(key, None)
 
     def testSetExposureInfo(self):
-        exposureInfo = afwImage.ExposureInfo()
+        exposureInfo = self._makeExposureInfoWithFilters()
         exposureInfo.setWcs(self.wcs)
-        exposureInfo.setDetector(self.detector)
-        gFilter = afwImage.Filter("g")
-        gFilterLabel = afwImage.FilterLabel(band="g")
-        exposureInfo.setFilter(gFilter)
-        exposureInfo.setFilterLabel(gFilterLabel)
-        maskedImage = afwImage.MaskedImageF(inFilePathSmall)
+        maskedImage = self._readMaskedImageSmall()
         exposure = afwImage.ExposureF(maskedImage)
         self.assertFalse(exposure.hasWcs())
 
@@ -271,8 +292,8 @@ class ExposureTestCase(lsst.utils.tests.TestCase):
                          self.detector.getName())
         self.assertEqual(exposure.getDetector().getSerial(),
                          self.detector.getSerial())
-        self.assertEqual(exposure.getFilter(), gFilter)
-        self.assertEqual(exposure.getFilterLabel(), gFilterLabel)
+        self.assertEqual(exposure.getFilter(), self.gFilter)
+        self.assertEqual(exposure.getFilterLabel(), self.gFilterLabel)
 
     def testDefaultFilter(self):
         """Test that old convention of having a "default" filter replaced with `None`.
@@ -296,24 +317,17 @@ class ExposureTestCase(lsst.utils.tests.TestCase):
             weather=weather,
         )
         photoCalib = afwImage.PhotoCalib(3.4, 5.6)
-        exposureInfo = afwImage.ExposureInfo()
+        exposureInfo = self._makeExposureInfoWithFilters()
         exposureInfo.setVisitInfo(visitInfo)
         exposureInfo.setPhotoCalib(photoCalib)
-        exposureInfo.setDetector(self.detector)
-        gFilter = afwImage.Filter("g")
-        gFilterLabel = afwImage.FilterLabel(band="g")
-        exposureInfo.setFilter(gFilter)
-        exposureInfo.setFilterLabel(gFilterLabel)
-        maskedImage = afwImage.MaskedImageF(inFilePathSmall)
+        maskedImage = self._readMaskedImageSmall()
         exposure = afwImage.ExposureF(maskedImage, exposureInfo)
-        with lsst.utils.tests.getTempFilePath(".fits") as tmpFile:
-            exposure.writeFits(tmpFile)
-            rtExposure = afwImage.ExposureF(tmpFile)
+        rtExposure = self._roundTrip(exposure)
         rtVisitInfo = rtExposure.getInfo().getVisitInfo()
         self.assertEqual(rtVisitInfo.getWeather(), weather)
         self.assertEqual(rtExposure.getPhotoCalib(), photoCalib)
-        self.assertEqual(rtExposure.getFilter(), gFilter)
-        self.assertEqual(rtExposure.getFilterLabel(), gFilterLabel)
+        self.assertEqual(rtExposure.getFilter(), self.gFilter)
+        self.assertEqual(rtExposure.getFilterLabel(), self.gFilterLabel)
 
     def testSetMembers(self):
         """
@@ -321,12 +335,12 @@ class ExposureTestCase(lsst.utils.tests.TestCase):
         """
         exposure = afwImage.ExposureF()
 
-        maskedImage = afwImage.MaskedImageF(inFilePathSmall)
+        maskedImage = self._readMaskedImageSmall()
         exposure.setMaskedImage(maskedImage)
         exposure.setWcs(self.wcs)
         exposure.setDetector(self.detector)
-        exposure.setFilter(afwImage.Filter("g"))
-        exposure.setFilterLabel(afwImage.FilterLabel(band="g"))
+        exposure.setFilter(self.gFilter)
+        exposure.setFilterLabel(self.gFilterLabel)
 
         self.assertEqual(exposure.getDetector().getName(),
                          self.detector.getName())
@@ -404,12 +418,8 @@ class ExposureTestCase(lsst.utils.tests.TestCase):
 
         subRegion3 = lsst.geom.Box2I(lsst.geom.Point2I(100, 100),
                                      lsst.geom.Extent2I(10, 10))
-
-        def getSubRegion():
-            self.exposureCrWcs.Factory(
-                self.exposureCrWcs, subRegion3, afwImage.LOCAL)
-
-        self.assertRaises(pexExcept.LengthError, getSubRegion)
+        self.assertRaises(pexExcept.LengthError, self.exposureCrWcs.Factory,
+                          self.exposureCrWcs, subRegion3, afwImage.LOCAL)
 
         # this subRegion is not valid and should trigger an exception
         # from the MaskedImage class only for the MaskedImage small_MI.
@@ -417,19 +427,11 @@ class ExposureTestCase(lsst.utils.tests.TestCase):
 
         subRegion4 = lsst.geom.Box2I(lsst.geom.Point2I(250, 250),
                                      lsst.geom.Extent2I(10, 10))
-
-        def getSubRegion():
-            self.exposureCrWcs.Factory(
-                self.exposureCrWcs, subRegion4, afwImage.LOCAL)
-
-        self.assertRaises(pexExcept.LengthError, getSubRegion)
+        self.assertRaises(pexExcept.LengthError, self.exposureCrWcs.Factory,
+                          self.exposureCrWcs, subRegion4, afwImage.LOCAL)
 
         # check the sub- and parent- exposures are using the same Wcs
         # transformation
-        subBBox = lsst.geom.Box2I(lsst.geom.Point2I(40, 50),
-                                  lsst.geom.Extent2I(10, 10))
-        subExposure = self.exposureCrWcs.Factory(
-            self.exposureCrWcs, subBBox, afwImage.LOCAL)
         parentSkyPos = self.exposureCrWcs.getWcs().pixelToSky(0, 0)
 
         subExpSkyPos = subExposure.getWcs().pixelToSky(0, 0)
@@ -439,8 +441,7 @@ class ExposureTestCase(lsst.utils.tests.TestCase):
     def testReadWriteFits(self):
         """Test readFits and writeFits.
         """
-        # This should pass without an exception
-        mainExposure = afwImage.ExposureF(inFilePathSmall)
+        mainExposure = afwImage.ExposureF(self._exposureSmall, True)
         mainExposure.setDetector(self.detector)
 
         subBBox = lsst.geom.Box2I(lsst.geom.Point2I(10, 10),
@@ -496,6 +497,16 @@ class ExposureTestCase(lsst.utils.tests.TestCase):
             self.assertIsNotNone(psf)
             self.assertEqual(psf, self.psf)
 
+    def _roundTrip(self, exposure):
+        """Write an Exposure to an in-memory FITS file and read it back.
+
+        testReadWriteFits still goes through a real file, so only use this
+        where the on-disk path isn't what's being tested.
+        """
+        manager = MemFileManager()
+        exposure.writeFits(manager)
+        return type(exposure)(manager)
+
     def checkWcs(self, parentExposure, subExposure):
         """Compare WCS at corner points of a sub-exposure and its parent exposure
            By using the function indexToPosition, we should be able to convert the indices
@@ -510,17 +521,12 @@ class ExposureTestCase(lsst.utils.tests.TestCase):
         mainWcs = parentExposure.getWcs()
         subWcs = subExposure.getWcs()
 
-        for xSubInd in (0, subDim.getX()-1):
-            for ySubInd in (0, subDim.getY()-1):
-                self.assertSpherePointsAlmostEqual(
-                    mainWcs.pixelToSky(
-                        afwImage.indexToPosition(xSubInd),
-                        afwImage.indexToPosition(ySubInd),
-                    ),
-                    subWcs.pixelToSky(
-                        afwImage.indexToPosition(xSubInd),
-                        afwImage.indexToPosition(ySubInd),
-                    ))
+        # Transform all four corners with a single call to each WCS
+        xs = [afwImage.indexToPosition(0), afwImage.indexToPosition(subDim.getX()-1)]
+        ys = [afwImage.indexToPosition(0), afwImage.indexToPosition(subDim.getY()-1)]
+        cornerList = [lsst.geom.Point2D(x, y) for x in xs for y in ys]
+        self.assertSpherePointListsAlmostEqual(mainWcs.pixelToSky(cornerList),
+                                               subWcs.pixelToSky(cornerList))
 
     def cmpExposure(self, e1, e2):
         self.assertEqual(e1.getDetector().getName(),
@@ -552,8 +558,8 @@ class ExposureTestCase(lsst.utils.tests.TestCase):
         exposureU = afwImage.ExposureU(inFilePathSmall, allowUnsafe=True)
         exposureU.setWcs(self.wcs)
         exposureU.setDetector(self.detector)
-        exposureU.setFilter(afwImage.Filter("g"))
-        exposureU.setFilterLabel(afwImage.FilterLabel(band="g"))
+        exposureU.setFilter(self.gFilter)
+        exposureU.setFilterLabel(self.gFilterLabel)
         exposureU.setPsf(DummyPsf(4.0))
         infoU = exposureU.getInfo()
         for key, value in self.extras.items():
@@ -574,6 +580,11 @@ class ExposureTestCase(lsst.utils.tests.TestCase):
         # self.assertEqual(exposureU.getDetector().getCenterPixel()[0], x0)
         # self.assertEqual(exposureU.getDetector().getCenterPixel()[1], y0)
 
+    def _assertArrayAllEqual(self, array, value):
+        """Assert that every element of ``array`` is exactly ``value``."""
+        self.assertEqual(array.min(), value)
+        self.assertEqual(array.max(), value)
+
     def testDeepCopyData(self):
         """Make sure a deep copy of an Exposure has its own data (ticket #2625)
         """
@@ -589,13 +600,13 @@ class ExposureTestCase(lsst.utils.tests.TestCase):
         miCopy.getMask().set(2)
         miCopy.getVariance().set(175)
 
-        self.assertFloatsAlmostEqual(miCopy.getImage().getArray(), -50)
-        self.assertTrue(np.all(miCopy.getMask().getArray() == 2))
-        self.assertFloatsAlmostEqual(miCopy.getVariance().getArray(), 175)
+        self._assertArrayAllEqual(miCopy.getImage().getArray(), -50)
+        self._assertArrayAllEqual(miCopy.getMask().getArray(), 2)
+        self._assertArrayAllEqual(miCopy.getVariance().getArray(), 175)
 
-        self.assertFloatsAlmostEqual(mi.getImage().getArray(), 100)
-        self.assertTrue(np.all(mi.getMask().getArray() == 5))
-        self.assertFloatsAlmostEqual(mi.getVariance().getArray(), 200)
+        self._assertArrayAllEqual(mi.getImage().getArray(), 100)
+        self._assertArrayAllEqual(mi.getMask().getArray(), 5)
+        self._assertArrayAllEqual(mi.getVariance().getArray(), 200)
 
     def testDeepCopySubData(self):
         """Make sure a deep copy of a subregion of an Exposure has its own data (ticket #2625)
@@ -613,13 +624,13 @@ class ExposureTestCase(lsst.utils.tests.TestCase):
         miCopy.getMask().set(2)
         miCopy.getVariance().set(175)
 
-        self.assertFloatsAlmostEqual(miCopy.getImage().getArray(), -50)
-        self.assertTrue(np.all(miCopy.getMask().getArray() == 2))
-        self.assertFloatsAlmostEqual(miCopy.getVariance().getArray(), 175)
+        self._assertArrayAllEqual(miCopy.getImage().getArray(), -50)
+        self._assertArrayAllEqual(miCopy.getMask().getArray(), 2)
+        self._assertArrayAllEqual(miCopy.getVariance().getArray(), 175)
 
-        self.assertFloatsAlmostEqual(mi.getImage().getArray(), 100)
-        self.assertTrue(np.all(mi.getMask().getArray() == 5))
-        self.assertFloatsAlmostEqual(mi.getVariance().getArray(), 200)
+        self._assertArrayAllEqual(mi.getImage().getArray(), 100)
+        self._assertArrayAllEqual(mi.getMask().getArray(), 5)
+        self._assertArrayAllEqual(mi.getVariance().getArray(), 200)
 
     def testDeepCopyMetadata(self):
         """Make sure a deep copy of an Exposure has a deep copy of metadata (ticket #2568)
@@ -697,27 +708,23 @@ class ExposureTestCase(lsst.utils.tests.TestCase):
             self.assertTrue(frazzle)
 
     def testArchiveKeys(self):
-        with lsst.utils.tests.getTempFilePath(".fits") as tmpFile:
-            exposure1 = afwImage.ExposureF(100, 100, self.wcs)
-            exposure1.setPsf(self.psf)
-            exposure1.writeFits(tmpFile)
-            exposure2 = afwImage.ExposureF(tmpFile)
-            self.assertFalse(exposure2.getMetadata().exists("AR_ID"))
-            self.assertFalse(exposure2.getMetadata().exists("PSF_ID"))
-            self.assertFalse(exposure2.getMetadata().exists("WCS_ID"))
+        exposure1 = afwImage.ExposureF(100, 100, self.wcs)
+        exposure1.setPsf(self.psf)
+        exposure2 = self._roundTrip(exposure1)
+        self.assertFalse(exposure2.getMetadata().exists("AR_ID"))
+        self.assertFalse(exposure2.getMetadata().exists("PSF_ID"))
+        self.assertFalse(exposure2.getMetadata().exists("WCS_ID"))
 
     def testTicket2861(self):
-        with lsst.utils.tests.getTempFilePath(".fits") as tmpFile:
-            exposure1 = afwImage.ExposureF(100, 100, self.wcs)
-            exposure1.setPsf(self.psf)
-            schema = afwTable.ExposureTable.makeMinimalSchema()
-            coaddInputs = afwImage.CoaddInputs(schema, schema)
-            exposure1.getInfo().setCoaddInputs(coaddInputs)
-            exposure2 = afwImage.ExposureF(exposure1, True)
-            self.assertIsNotNone(exposure2.getInfo().getCoaddInputs())
-            exposure2.writeFits(tmpFile)
-            exposure3 = afwImage.ExposureF(tmpFile)
-            self.assertIsNotNone(exposure3.getInfo().getCoaddInputs())
+        exposure1 = afwImage.ExposureF(100, 100, self.wcs)
+        exposure1.setPsf(self.psf)
+        schema = afwTable.ExposureTable.makeMinimalSchema()
+        coaddInputs = afwImage.CoaddInputs(schema, schema)
+        exposure1.getInfo().setCoaddInputs(coaddInputs)
+        exposure2 = afwImage.ExposureF(exposure1, True)
+        self.assertIsNotNone(exposure2.getInfo().getCoaddInputs())
+        exposure3 = self._roundTrip(exposure2)
+        self.assertIsNotNone(exposure3.getInfo().getCoaddInputs())
 
     def testGetCutout(self):
         wcs = self.smallExposure.getWcs()
@@ -725,31 +732,26 @@ class ExposureTestCase(lsst.utils.tests.TestCase):
         dimensions = [lsst.geom.Extent2I(100, 50), lsst.geom.Extent2I(15, 15), lsst.geom.Extent2I(0, 10),
                       lsst.geom.Extent2I(25, 30), lsst.geom.Extent2I(15, -5),
                       2*self.smallExposure.getDimensions()]
-        locations = [("center", self._getExposureCenter(self.smallExposure)),
-                     ("edge", wcs.pixelToSky(lsst.geom.Point2D(0, 0))),
-                     ("rounding test", wcs.pixelToSky(lsst.geom.Point2D(0.2, 0.7))),
-                     ("just inside", wcs.pixelToSky(lsst.geom.Point2D(-0.5 + 1e-4, -0.5 + 1e-4))),
-                     ("just outside", wcs.pixelToSky(lsst.geom.Point2D(-0.5 - 1e-4, -0.5 - 1e-4))),
-                     ("outside", wcs.pixelToSky(lsst.geom.Point2D(-1000, -1000)))]
         for cutoutSize in dimensions:
-            for label, cutoutCenter in locations:
-                msg = 'Cutout size = %s, location = %s' % (cutoutSize, label)
-                if "outside" not in label and all(cutoutSize.gt(0)):
-                    cutout = self.smallExposure.getCutout(cutoutCenter, cutoutSize)
-                    centerInPixels = wcs.skyToPixel(cutoutCenter)
-                    precision = (1 + 1e-4)*np.sqrt(0.5)*wcs.getPixelScale(centerInPixels)
-                    self._checkCutoutProperties(cutout, cutoutSize, cutoutCenter, precision, msg)
-                    self._checkCutoutPixels(
-                        cutout,
-                        self._getValidCorners(self.smallExposure.getBBox(), cutout.getBBox()),
-                        msg)
-
-                    # Need a valid WCS
-                    with self.assertRaises(pexExcept.LogicError, msg=msg):
-                        self.exposureMiOnly.getCutout(cutoutCenter, cutoutSize)
-                else:
-                    with self.assertRaises(pexExcept.InvalidParameterError, msg=msg):
-                        self.smallExposure.getCutout(cutoutCenter, cutoutSize)
+            for label, cutoutCenter in self._cutoutLocations:
+                with self.subTest(size=cutoutSize, location=label):
+                    msg = 'Cutout size = %s, location = %s' % (cutoutSize, label)
+                    if "outside" not in label and all(cutoutSize.gt(0)):
+                        cutout = self.smallExposure.getCutout(cutoutCenter, cutoutSize)
+                        centerInPixels = wcs.skyToPixel(cutoutCenter)
+                        precision = (1 + 1e-4)*np.sqrt(0.5)*wcs.getPixelScale(centerInPixels)
+                        self._checkCutoutProperties(cutout, cutoutSize, cutoutCenter, precision, msg)
+                        self._checkCutoutPixels(
+                            cutout,
+                            self._getValidCorners(self.smallExposure.getBBox(), cutout.getBBox()),
+                            msg)
+
+                        # Need a valid WCS
+                        with self.assertRaises(pexExcept.LogicError, msg=msg):
+                            self.exposureMiOnly.getCutout(cutoutCenter, cutoutSize)
+                    else:
+                        with self.assertRaises(pexExcept.InvalidParameterError, msg=msg):
+                            self.smallExposure.getCutout(cutoutCenter, cutoutSize)
 
     def _checkCutoutProperties(self, cutout, size, center, precision, msg):
         """Test whether a cutout has the desired size and position.
@@ -780,20 +782,23 @@ class ExposureTestCase(lsst.utils.tests.TestCase):
         ----------
         cutout : `lsst.afw.image.Exposure`
             The cutout to test.
-        validCorners : iterable of `lsst.geom.Point2I`
-            The corners of ``cutout`` that should be drawn from the original image.
+        validCorners : `set` of `tuple` [`int`, `int`]
+            The ``(x, y)`` corners of ``cutout`` that should be drawn from the
+            original image.
         msg : `str`
             An error message suffix describing test parameters.
         """
         mask = cutout.getMaskedImage().getMask()
         edgeMask = mask.getPlaneBitMask("NO_DATA")
 
-        for corner in cutout.getBBox().getCorners():
-            maskBitsSet = mask[corner] & edgeMask
-            if corner in validCorners:
-                self.assertEqual(maskBitsSet, 0, msg=msg)
-            else:
-                self.assertEqual(maskBitsSet, edgeMask, msg=msg)
+        # Look up all four corners in the mask array at once
+        corners = cutout.getBBox().getCorners()
+        xIndices = [corner.getX() - mask.getX0() for corner in corners]
+        yIndices = [corner.getY() - mask.getY0() for corner in corners]
+        maskBitsSet = mask.array[yIndices, xIndices] & edgeMask
+        expected = [0 if (corner.getX(), corner.getY()) in validCorners else edgeMask
+                    for corner in corners]
+        np.testing.assert_array_equal(maskBitsSet, expected, err_msg=msg)
 
     def _getExposureCenter(self, exposure):
         """Return the sky coordinates of an Exposure's center.
@@ -815,34 +820,59 @@ class ExposureTestCase(lsst.utils.tests.TestCase):
 
         Parameters
         ----------
-        imageBox: `lsst.geom.Extent2I`
+        imageBox : `lsst.geom.Box2I`
             The bounding box of the original image.
         cutoutBox : `lsst.geom.Box2I`
             The bounding box of the cutout.
 
         Returns
         -------
-        corners : iterable of `lsst.geom.Point2I`
-            The corners that are drawn from the original image.
+        corners : `set` of `tuple` [`int`, `int`]
+            The ``(x, y)`` corners that are drawn from the original image.
         """
-        return [corner for corner in cutoutBox.getCorners() if corner in imageBox]
+        minX, minY = imageBox.getMinX(), imageBox.getMinY()
+        maxX, maxY = imageBox.getMaxX(), imageBox.getMaxY()
+        corners = ((corner.getX(), corner.getY()) for corner in cutoutBox.getCorners())
+        return {(x, y) for x, y in corners if minX <= x <= maxX and minY <= y <= maxY}
 
 
 class ExposureInfoTestCase(lsst.utils.tests.TestCase):
-    def setUp(self):
-        super().setUp()
-
+    # ExposureInfo key, test attribute holding a value for it, and the
+    # has/get accessor suffix for the component
+    _ALIAS_SPECS = (
+        ("KEY_WCS", "wcs", "Wcs"),
+        ("KEY_PSF", "psf", "Psf"),
+        ("KEY_PHOTO_CALIB", "photoCalib", "PhotoCalib"),
+        ("KEY_DETECTOR", "detector", "Detector"),
+        ("KEY_VALID_POLYGON", "polygon", "ValidPolygon"),
+        ("KEY_COADD_INPUTS", "coaddInputs", "CoaddInputs"),
+        ("KEY_AP_CORR_MAP", "apCorrMap", "ApCorrMap"),
+        ("KEY_TRANSMISSION_CURVE", "transmissionCurve", "TransmissionCurve"),
+    )
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.detector = DetectorWrapper().detector
+        # No test here modifies the filter registry, so define it once
         afwImage.Filter.reset()
         afwImage.FilterProperty.reset()
         defineFilter("g", 470.0)
 
+    @classmethod
+    def tearDownClass(cls):
+        del cls.detector
+        super().tearDownClass()
+
+    def setUp(self):
+        super().setUp()
+
         self.wcs = afwGeom.makeSkyWcs(lsst.geom.Point2D(0.0, 0.0),
                                       lsst.geom.SpherePoint(2.0, 34.0, lsst.geom.degrees),
                                       np.identity(2),
                                       )
         self.photoCalib = afwImage.PhotoCalib(1.5)
         self.psf = DummyPsf(2.0)
-        self.detector = DetectorWrapper().detector
         self.polygon = afwGeom.Polygon(lsst.geom.Box2D(lsst.geom.Point2D(0.0, 0.0),
                                                        lsst.geom.Point2D(25.0, 20.0)))
         self.coaddInputs = afwImage.CoaddInputs()
@@ -877,22 +907,11 @@ class ExposureInfoTestCase(lsst.utils.tests.TestCase):
 
     def testAliases(self):
         cls = type(self.exposureInfo)
-        self._checkAlias(self.exposureInfo, cls.KEY_WCS, self.wcs,
-                         self.exposureInfo.hasWcs, self.exposureInfo.getWcs)
-        self._checkAlias(self.exposureInfo, cls.KEY_PSF, self.psf,
-                         self.exposureInfo.hasPsf, self.exposureInfo.getPsf)
-        self._checkAlias(self.exposureInfo, cls.KEY_PHOTO_CALIB, self.photoCalib,
-                         self.exposureInfo.hasPhotoCalib, self.exposureInfo.getPhotoCalib)
-        self._checkAlias(self.exposureInfo, cls.KEY_DETECTOR, self.detector,
-                         self.exposureInfo.hasDetector, self.exposureInfo.getDetector)
-        self._checkAlias(self.exposureInfo, cls.KEY_VALID_POLYGON, self.polygon,
-                         self.exposureInfo.hasValidPolygon, self.exposureInfo.getValidPolygon)
-        self._checkAlias(self.exposureInfo, cls.KEY_COADD_INPUTS, self.coaddInputs,
-                         self.exposureInfo.hasCoaddInputs, self.exposureInfo.getCoaddInputs)
-        self._checkAlias(self.exposureInfo, cls.KEY_AP_CORR_MAP, self.apCorrMap,
-                         self.exposureInfo.hasApCorrMap, self.exposureInfo.getApCorrMap)
-        self._checkAlias(self.exposureInfo, cls.KEY_TRANSMISSION_CURVE, self.transmissionCurve,
-                         self.exposureInfo.hasTransmissionCurve, self.exposureInfo.getTransmissionCurve)
+        for keyName, valueName, component in self._ALIAS_SPECS:
+            with self.subTest(key=keyName):
+                self._checkAlias(self.exposureInfo, getattr(cls, keyName), getattr(self, valueName),
+                                 getattr(self.exposureInfo, "has" + component),
+                                 getattr(self.exposureInfo, "get" + component))
 
     def testCopy(self):
         # Test that ExposureInfos have independently settable state
@@ -913,9 +932,32 @@ class ExposureNoAfwdataTestCase(lsst.utils.tests.TestCase):
 
     These tests use the trivial exposures written to ``afw/tests/data``.
     """
-    def setUp(self):
-        self.dataDir = os.path.join(os.path.split(__file__)[0], "data")
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        dataDir = os.path.join(os.path.split(__file__)[0], "data")
+        # Read each fixture file once; the tests only inspect what was read.
+        # The metadata reader results are kept rather than the readers, so
+        # no files are left open.
+        cls._exposures = {}
+        cls._readerPhotoCalibs = {}
+        for filename in ("exposure-noversion.fits", "exposure-version-0.fits",
+                         "exposure-version-1.fits", "exposure-version-2.fits"):
+            path = os.path.join(dataDir, filename)
+            cls._exposures[filename] = afwImage.ExposureF.readFits(path)
+            if filename != "exposure-noversion.fits":
+                reader = afwImage.ExposureFitsReader(path)
+                cls._readerPhotoCalibs[filename] = (reader.readExposureInfo().getPhotoCalib(),
+                                                    reader.readPhotoCalib())
+                del reader
+
+    @classmethod
+    def tearDownClass(cls):
+        del cls._exposures
+        del cls._readerPhotoCalibs
+        super().tearDownClass()
 
+    def setUp(self):
         # Check the values below against what was written by comparing with
         # the code in `afw/tests/data/makeTestExposure.py`
         nx = ny = 10
@@ -930,68 +972,31 @@ class ExposureNoAfwdataTestCase(lsst.utils.tests.TestCase):
         self.v1FilterLabel = afwImage.FilterLabel(physical="ha")
         self.v2FilterLabel = afwImage.FilterLabel(band="N656", physical="ha")
 
-    def testReadUnversioned(self):
-        """Test that we can read an unversioned (implicit verison 0) file.
-        """
-        filename = os.path.join(self.dataDir, "exposure-noversion.fits")
-        exposure = afwImage.ExposureF.readFits(filename)
-
-        self.assertMaskedImagesEqual(exposure.maskedImage, self.maskedImage)
+    def testReadVersions(self):
+        """Test that we can read every ExposureInfo version.
 
-        self.assertEqual(exposure.getPhotoCalib(), self.v0PhotoCalib)
-        self.assertEqual(exposure.getFilterLabel(), self.v1FilterLabel)
-
-    def testReadVersion0(self):
-        """Test that we can read a version 0 file.
-        This file should be identical to the unversioned one, except that it
-        is marked as ExposureInfo version 0 in the header.
-        """
-        filename = os.path.join(self.dataDir, "exposure-version-0.fits")
-        exposure = afwImage.ExposureF.readFits(filename)
-
-        self.assertMaskedImagesEqual(exposure.maskedImage, self.maskedImage)
-
-        self.assertEqual(exposure.getPhotoCalib(), self.v0PhotoCalib)
-        self.assertEqual(exposure.getFilterLabel(), self.v1FilterLabel)
-
-        # Check that the metadata reader parses the file correctly
-        reader = afwImage.ExposureFitsReader(filename)
-        self.assertEqual(reader.readExposureInfo().getPhotoCalib(), self.v0PhotoCalib)
-        self.assertEqual(reader.readPhotoCalib(), self.v0PhotoCalib)
-
-    def testReadVersion1(self):
-        """Test that we can read a version 1 file.
-        Version 1 replaced Calib with PhotoCalib.
-        """
-        filename = os.path.join(self.dataDir, "exposure-version-1.fits")
-        exposure = afwImage.ExposureF.readFits(filename)
-
-        self.assertMaskedImagesEqual(exposure.maskedImage, self.maskedImage)
-
-        self.assertEqual(exposure.getPhotoCalib(), self.v1PhotoCalib)
-        self.assertEqual(exposure.getFilterLabel(), self.v1FilterLabel)
-
-        # Check that the metadata reader parses the file correctly
-        reader = afwImage.ExposureFitsReader(filename)
-        self.assertEqual(reader.readExposureInfo().getPhotoCalib(), self.v1PhotoCalib)
-        self.assertEqual(reader.readPhotoCalib(), self.v1PhotoCalib)
-
-    def testReadVersion2(self):
-        """Test that we can read a version 2 file.
-        Version 2 replaced Filter with FilterLabel.
+        The unversioned file is implicitly version 0, and the version 0 file
+        should be identical to it apart from its header. Version 1 replaced
+        Calib with PhotoCalib, and version 2 replaced Filter with FilterLabel.
         """
-        filename = os.path.join(self.dataDir, "exposure-version-2.fits")
-        exposure = afwImage.ExposureF.readFits(filename)
-
-        self.assertMaskedImagesEqual(exposure.maskedImage, self.maskedImage)
-
-        self.assertEqual(exposure.getPhotoCalib(), self.v1PhotoCalib)
-        self.assertEqual(exposure.getFilterLabel(), self.v2FilterLabel)
-
-        # Check that the metadata reader parses the file correctly
-        reader = afwImage.ExposureFitsReader(filename)
-        self.assertEqual(reader.readExposureInfo().getPhotoCalib(), self.v1PhotoCalib)
-        self.assertEqual(reader.readPhotoCalib(), self.v1PhotoCalib)
+        versions = [("exposure-noversion.fits", self.v0PhotoCalib, self.v1FilterLabel),
+                    ("exposure-version-0.fits", self.v0PhotoCalib, self.v1FilterLabel),
+                    ("exposure-version-1.fits", self.v1PhotoCalib, self.v1FilterLabel),
+                    ("exposure-version-2.fits", self.v1PhotoCalib, self.v2FilterLabel)]
+        for filename, photoCalib, filterLabel in versions:
+            with self.subTest(filename=filename):
+                exposure = self._exposures[filename]
+
+                self.assertMaskedImagesEqual(exposure.maskedImage, self.maskedImage)
+
+                self.assertEqual(exposure.getPhotoCalib(), photoCalib)
+                self.assertEqual(exposure.getFilterLabel(), filterLabel)
+
+                # Check that the metadata reader parses the file correctly
+                if filename in self._readerPhotoCalibs:
+                    infoPhotoCalib, readerPhotoCalib = self._readerPhotoCalibs[filename]
+                    self.assertEqual(infoPhotoCalib, photoCalib)
+                    self.assertEqual(readerPhotoCalib, photoCalib)
 
 
 class MemoryTester(lsst.utils.tests.MemoryTestCase):
@@ -98,8 +98,26 @@ class ExposureTableTestCase(lsst.utils.tests.TestCase):
         self.assertIsNotNone(psf2)
         self.assertEqual(psf1, psf2)
 
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # Components attached to the test records; no test modifies them
+        cls.wcs = cls.createWcs()
+        # these numbers are what were persisted as `Calib` objects in the files.
+        cls.photoCalib = lsst.afw.image.makePhotoCalibFromCalibZeroPoint(56.0, 2.2)
+        cls.visitInfo = cls.createVisitInfo()
+        cls.detector = DetectorWrapper().detector
+
+    @classmethod
+    def tearDownClass(cls):
+        del cls.wcs
+        del cls.photoCalib
+        del cls.visitInfo
+        del cls.detector
+        super().tearDownClass()
+
     def setUp(self):
-        np.random.seed(1)
+        self.rng = np.random.default_rng(1)
         schema = lsst.afw.table.ExposureTable.makeMinimalSchema()
         self.ka = schema.addField("a", type=np.float64, doc="doc for a")
         self.kb = schema.addField("b", type=np.int64, doc="doc for b")
@@ -107,7 +125,6 @@ class ExposureTableTestCase(lsst.utils.tests.TestCase):
         self.plist = PropertyList()
         self.plist['VALUE'] = 1.0
         self.cat.setMetadata(self.plist)
-        self.wcs = self.createWcs()
         self.psf = DummyPsf(2.0)
         self.bbox0 = lsst.geom.Box2I(
             lsst.geom.Box2D(
@@ -121,10 +138,6 @@ class ExposureTableTestCase(lsst.utils.tests.TestCase):
                 self.wcs.getPixelOrigin() + lsst.geom.Extent2D(3.0, 6.0)
             )
         )
-        # these numbers are what were persisted as `Calib` objects in the files.
-        self.photoCalib = lsst.afw.image.makePhotoCalibFromCalibZeroPoint(56.0, 2.2)
-        self.visitInfo = self.createVisitInfo()
-        self.detector = DetectorWrapper().detector
         record0 = self.cat.addNew()
         record0.setId(1)
         record0.set(self.ka, np.pi)
@@ -148,10 +161,6 @@ class ExposureTableTestCase(lsst.utils.tests.TestCase):
     def tearDown(self):
         del self.cat
         del self.psf
-        del self.wcs
-        del self.photoCalib
-        del self.visitInfo
-        del self.detector
 
     def testAccessors(self):
         record0 = self.cat[0]
@@ -201,7 +210,7 @@ class ExposureTableTestCase(lsst.utils.tests.TestCase):
     def testGeometry(self):
         bigBox = lsst.geom.Box2D(lsst.geom.Box2I(self.bbox0))
         bigBox.include(lsst.geom.Box2D(self.bbox1))
-        points = (np.random.rand(100, 2)*np.array([bigBox.getWidth(), bigBox.getHeight()])
+        points = (self.rng.random((100, 2))*np.array([bigBox.getWidth(), bigBox.getHeight()])
                   + np.array([bigBox.getMinX(), bigBox.getMinY()]))
 
         # make a very slightly perturbed wcs so the celestial transform isn't a
@@ -214,14 +223,23 @@ class ExposureTableTestCase(lsst.utils.tests.TestCase):
             crpix=self.wcs.getPixelOrigin() + lsst.geom.Extent2D(30.0, -50.0),
             cdMatrix=self.wcs.getCdMatrix()*1.1,
         )
-        for x1, y1 in points:
-            p1 = lsst.geom.Point2D(x1, y1)
-            c = self.wcs.pixelToSky(p1)
-            p2 = wcs2.skyToPixel(c)
+        # Transform all the points with a single call to each WCS
+        pixels1 = [lsst.geom.Point2D(x1, y1) for x1, y1 in points.tolist()]
+        coords = self.wcs.pixelToSky(pixels1)
+        pixels2 = wcs2.skyToPixel(coords)
+        # Which points fall within which record's bounding box; Box2D
+        # includes its minimum edges but not its maximum ones
+        records = list(self.cat)
+        bounds = np.array([[box.getMinX(), box.getMinY(), box.getMaxX(), box.getMaxY()]
+                           for box in (lsst.geom.Box2D(record.getBBox()) for record in records)])
+        xs = points[:, 0, np.newaxis]
+        ys = points[:, 1, np.newaxis]
+        insideMatrix = ((xs >= bounds[:, 0]) & (ys >= bounds[:, 1])
+                        & (xs < bounds[:, 2]) & (ys < bounds[:, 3]))
+        for p1, c, p2, insideRow in zip(pixels1, coords, pixels2, insideMatrix):
             subset1 = self.cat.subsetContaining(c)
             subset2 = self.cat.subsetContaining(p2, wcs2)
-            for record in self.cat:
-                inside = lsst.geom.Box2D(record.getBBox()).contains(p1)
+            for record, inside in zip(records, insideRow.tolist()):
                 self.assertEqual(inside, record.contains(c))
                 self.assertEqual(inside, record.contains(p2, wcs2))
                 self.assertEqual(inside, record.contains(p1, self.wcs))
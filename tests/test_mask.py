@@ -625,17 +625,15 @@ class OldMaskTestCase(unittest.TestCase):
 
 def printMaskPlane(mask, plane,
                    xrange=list(range(250, 300, 10)), yrange=list(range(300, 400, 20))):
-    """Print parts of the specified plane of the mask"""
+    """Print parts of the specified plane (a bit index) of the mask"""
 
     xrange = list(range(min(xrange), max(xrange), 25))
     yrange = list(range(min(yrange), max(yrange), 25))
 
-    for x in xrange:
-        for y in yrange:
-            if False:                   # mask(x,y) confuses swig
-                print(x, y, mask(x, y), mask(x, y, plane))
-            else:
-                print(x, y, mask(x, y, plane))
+    xs, ys = np.meshgrid(xrange, yrange, indexing="ij")
+    isSet = (mask.getArray()[ys - mask.getY0(), xs - mask.getX0()] >> plane) & 1
+    for x, y, value in zip(xs.ravel().tolist(), ys.ravel().tolist(), isSet.ravel().tolist()):
+        print(x, y, value)
 
 
 class TestMemory(lsst.utils.tests.MemoryTestCase):
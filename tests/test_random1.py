@@ -29,10 +29,12 @@ or
 
 """
 
+import os
 import sys
-import time
 import unittest
 
+import numpy as np
+
 import lsst.pex.exceptions
 import lsst.utils.tests
 import lsst.geom
@@ -41,12 +43,16 @@ import lsst.afw.math as afwMath
 
 
 def checkRngEquivalence(rng1, rng2):
-    for i in range(1000):
-        assert rng1.uniform() == rng2.uniform()
+    # Draw each sequence in one call rather than 1000 uniform() calls
+    image1 = afwImage.ImageD(lsst.geom.Extent2I(1000, 1))
+    image2 = afwImage.ImageD(lsst.geom.Extent2I(1000, 1))
+    afwMath.randomUniformImage(image1, rng1)
+    afwMath.randomUniformImage(image2, rng2)
+    assert np.array_equal(image1.array, image2.array)
 
 
 def getSeed():
-    return int(time.time() * 1000000.0) % 1000000
+    return int.from_bytes(os.urandom(4), "little") % 1000000
 
 
 class RandomTestCase(unittest.TestCase):
@@ -82,12 +88,21 @@ class RandomTestCase(unittest.TestCase):
 class RandomImageTestCase(unittest.TestCase):
     """A test case for lsst.afw.math.Random applied to Images"""
 
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # Every randomXxxImage call overwrites all the pixels, so one image
+        # can be shared by all tests
+        cls._image = afwImage.ImageF(lsst.geom.Extent2I(1000, 1000))
+
+    @classmethod
+    def tearDownClass(cls):
+        del cls._image
+        super().tearDownClass()
+
     def setUp(self):
         self.rand = afwMath.Random()
-        self.image = afwImage.ImageF(lsst.geom.Extent2I(1000, 1000))
-
-    def tearDown(self):
-        del self.image
+        self.image = self._image
 
     def testState(self):
         for i in range(100):
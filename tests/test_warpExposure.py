@@ -21,6 +21,7 @@
 
 """Test warpExposure
 """
+import functools
 import os
 import unittest
 
@@ -41,17 +42,17 @@ from lsst.log import Log
 
 # Change the level to Log.DEBUG to see debug messages
 Log.getLogger("afw.image.Mask").setLevel(Log.INFO)
-Log.getLogger("TRACE2.afw.math.warp").setLevel(Log.INFO)
-Log.getLogger("TRACE3.afw.math.warp").setLevel(Log.INFO)
+Log.getLogger("TRACE2.afw.math.warp").setLevel(Log.ERROR)
+Log.getLogger("TRACE3.afw.math.warp").setLevel(Log.ERROR)
 
 afwDisplay.setDefaultMaskTransparency(75)
 
 display = False
 # set True to save afw-warped images as FITS files
 SAVE_FITS_FILES = False
-# set True to save failed afw-warped images as FITS files even if
-# SAVE_FITS_FILES is False
-SAVE_FAILED_FITS_FILES = True
+# set True (or set $LSST_AFW_SAVE_FAILED to 1) to save failed afw-warped
+# images as FITS files even if SAVE_FITS_FILES is False
+SAVE_FAILED_FITS_FILES = os.environ.get("LSST_AFW_SAVE_FAILED", "0") != "0"
 
 try:
     afwdataDir = lsst.utils.getPackageDir("afwdata")
@@ -87,12 +88,97 @@ def makeVisitInfo():
                               )
 
 
+@functools.lru_cache(maxsize=None)
+def makeSimpleSkyWcs(crpix, crval, scale, flipX=False, projection="TAN"):
+    """Return a simple SkyWcs, built once per distinct set of arguments.
+
+    Parameters
+    ----------
+    crpix : `tuple` [`float`, `float`]
+        Reference pixel position.
+    crval : `tuple` [`float`, `float`]
+        Reference sky position (RA, Dec) in degrees.
+    scale : `float`
+        Pixel scale in degrees.
+    flipX : `bool`
+        Flip the x axis? Passed to `lsst.afw.geom.makeCdMatrix`.
+    projection : `str`
+        WCS projection code.
+
+    Notes
+    -----
+    SkyWcs is immutable, so the cached objects can be shared between tests.
+    """
+    return afwGeom.makeSkyWcs(
+        crpix=lsst.geom.Point2D(*crpix),
+        crval=lsst.geom.SpherePoint(*crval, lsst.geom.degrees),
+        cdMatrix=afwGeom.makeCdMatrix(scale=scale*lsst.geom.degrees, flipX=flipX),
+        projection=projection,
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def readSwarpedImage(kernelName, useSubregion=False):
+    """Read a swarp-warped reference image from afwdata.
+
+    Parameters
+    ----------
+    kernelName : `str`
+        Name of the warping kernel swarp used.
+    useSubregion : `bool`
+        Return the warp of the "medsub" subregion instead of all of "med"?
+
+    Returns
+    -------
+    swarpedImage : `lsst.afw.image.ImageF`
+        The swarp-warped image; it is shared, so must not be modified.
+    swarpedWcs : `lsst.afw.geom.SkyWcs`
+        The WCS of ``swarpedImage``.
+
+    Notes
+    -----
+    test_warper.py has a copy of this function; keep the two in step.
+    """
+    prefix = "medsubswarp1" if useSubregion else "medswarp1"
+    swarpedImagePath = os.path.join(dataDir, f"{prefix}{kernelName}.fits")
+    swarpedDecoratedImage = afwImage.DecoratedImageF(swarpedImagePath)
+    swarpedImage = swarpedDecoratedImage.getImage()
+    swarpedWcs = afwGeom.makeSkyWcs(swarpedDecoratedImage.getMetadata())
+    return swarpedImage, swarpedWcs
+
+
 class WarpExposureTestCase(lsst.utils.tests.TestCase):
     """Test case for warpExposure
     """
+    # Source mask plane for verifyMaskWarp: every pixel has a distinct value
+    _maskRamp = np.arange(100*101, dtype=np.uint16).reshape(101, 100)
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        if afwdataDir is not None:
+            # Read medexp.fits once; tests warp from copies of it
+            cls._originalExposure = afwImage.ExposureF(originalExposurePath)
+            originalMetadata = afwImage.DecoratedImageF(originalExposurePath).getMetadata()
+            cls._originalSkyWcs = afwGeom.makeSkyWcs(originalMetadata)
+
+    @classmethod
+    def tearDownClass(cls):
+        if afwdataDir is not None:
+            del cls._originalExposure
+            del cls._originalSkyWcs
+        super().tearDownClass()
 
     def setUp(self):
-        np.random.seed(0)
+        self.rng = np.random.default_rng(0)
+
+    def _getOriginalExposure(self):
+        """Return a shallow copy of the exposure read from medexp.fits.
+
+        The copy has its own ExposureInfo, which may be modified freely, but
+        shares its pixels with the other copies, so they must not be written.
+        """
+        return afwImage.ExposureF(self._originalExposure, False)
 
     @unittest.skipIf(afwdataDir is None, "afwdata not setup")
     def testNullWarpExposure(self, interpLength=10):
@@ -105,7 +191,7 @@ class WarpExposureTestCase(lsst.utils.tests.TestCase):
         """
         imageUtils.defineFilter("i", 748.1)
 
-        originalExposure = afwImage.ExposureF(originalExposurePath)
+        originalExposure = self._getOriginalExposure()
         originalExposure.getInfo().setVisitInfo(makeVisitInfo())
         originalFilter = afwImage.Filter("i")
         originalPhotoCalib = afwImage.PhotoCalib(1.0e5, 1.0e3)
@@ -150,8 +236,11 @@ class WarpExposureTestCase(lsst.utils.tests.TestCase):
     def testNullWarpImage(self, interpLength=10):
         """Test that warpImage maps an image onto itself.
         """
-        originalExposure = afwImage.ExposureF(originalExposurePath)
-        afwWarpedExposure = afwImage.ExposureF(originalExposurePath)
+        originalExposure = self._getOriginalExposure()
+        # warpImage sets every destination pixel, so a blank exposure will do
+        afwWarpedExposure = afwImage.ExposureF(
+            originalExposure.getBBox(),
+            originalExposure.getWcs())
         originalImage = originalExposure.getMaskedImage().getImage()
         afwWarpedImage = afwWarpedExposure.getMaskedImage().getImage()
         originalWcs = originalExposure.getWcs()
@@ -173,7 +262,7 @@ class WarpExposureTestCase(lsst.utils.tests.TestCase):
     def testNullWcs(self, interpLength=10):
         """Cannot warp from or into an exposure without a Wcs.
         """
-        exposureWithWcs = afwImage.ExposureF(originalExposurePath)
+        exposureWithWcs = self._getOriginalExposure()
         mi = exposureWithWcs.getMaskedImage()
         exposureWithoutWcs = afwImage.ExposureF(mi.getDimensions())
         warpingControl = afwMath.WarpingControl(
@@ -188,11 +277,7 @@ class WarpExposureTestCase(lsst.utils.tests.TestCase):
     def testWarpIntoSelf(self, interpLength=10):
         """Cannot warp in-place
         """
-        wcs = afwGeom.makeSkyWcs(
-            crpix=lsst.geom.Point2D(0, 0),
-            crval=lsst.geom.SpherePoint(359, 0, lsst.geom.degrees),
-            cdMatrix=afwGeom.makeCdMatrix(1.0e-8*lsst.geom.degrees),
-        )
+        wcs = makeSimpleSkyWcs(crpix=(0, 0), crval=(359, 0), scale=1.0e-8)
         exposure = afwImage.ExposureF(lsst.geom.Extent2I(100, 100), wcs)
         maskedImage = exposure.getMaskedImage()
         warpingControl = afwMath.WarpingControl(
@@ -293,89 +378,53 @@ class WarpExposureTestCase(lsst.utils.tests.TestCase):
                     growFullMask=growFullMask,
                 )
 
-    def testMatchSwarpBilinearImage(self):
-        """Test that warpExposure matches swarp using a bilinear warping kernel
-        """
-        self.compareToSwarp("bilinear", useWarpExposure=False, atol=0.15)
-
-    def testMatchSwarpBilinearExposure(self):
-        """Test that warpExposure matches swarp using a bilinear warping kernel
-        """
-        self.compareToSwarp("bilinear", useWarpExposure=True,
-                            useSubregion=False, useDeepCopy=True)
-
-    def testMatchSwarpLanczos2Image(self):
-        """Test that warpExposure matches swarp using a lanczos2 warping kernel
-        """
-        self.compareToSwarp("lanczos2", useWarpExposure=False)
-
-    def testMatchSwarpLanczos2Exposure(self):
-        """Test that warpExposure matches swarp using a lanczos2 warping kernel.
-        """
-        self.compareToSwarp("lanczos2", useWarpExposure=True)
-
-    def testMatchSwarpLanczos2SubExposure(self):
-        """Test that warpExposure matches swarp using a lanczos2 warping kernel with a subexposure
-        """
-        for useDeepCopy in (False, True):
-            self.compareToSwarp("lanczos2", useWarpExposure=True,
-                                useSubregion=True, useDeepCopy=useDeepCopy)
-
-    def testMatchSwarpLanczos3Image(self):
-        """Test that warpExposure matches swarp using a lanczos2 warping kernel
+    def testMatchSwarp(self):
+        """Test that warpImage and warpExposure match swarp for each warping kernel
         """
-        self.compareToSwarp("lanczos3", useWarpExposure=False)
+        # kernel name and compareToSwarp arguments for each comparison
+        variants = [
+            ("bilinear", dict(useWarpExposure=False, atol=0.15)),
+            ("bilinear", dict(useWarpExposure=True, useSubregion=False, useDeepCopy=True)),
+            ("lanczos2", dict(useWarpExposure=False)),
+            ("lanczos2", dict(useWarpExposure=True)),
+            ("lanczos2", dict(useWarpExposure=True, useSubregion=True, useDeepCopy=False)),
+            ("lanczos2", dict(useWarpExposure=True, useSubregion=True, useDeepCopy=True)),
+            ("lanczos3", dict(useWarpExposure=False)),
+            ("lanczos3", dict(useWarpExposure=True)),
+            ("lanczos4", dict(useWarpExposure=False)),
+            ("lanczos4", dict(useWarpExposure=True)),
+            ("nearest", dict(useWarpExposure=True, atol=60)),
+        ]
+        for kernelName, kwargs in variants:
+            with self.subTest(kernelName=kernelName, **kwargs):
+                self.compareToSwarp(kernelName, **kwargs)
 
-    def testMatchSwarpLanczos3(self):
-        """Test that warpExposure matches swarp using a lanczos4 warping kernel.
+    @unittest.skipIf(afwdataDir is None, "afwdata not setup")
+    def testTransformBasedWarp(self):
+        """Test warping using TransformPoint2ToPoint2
         """
-        self.compareToSwarp("lanczos3", useWarpExposure=True)
+        kernelName = "lanczos3"
+        rtol = 4e-5
+        atol = 1e-2
 
-    def testMatchSwarpLanczos4Image(self):
-        """Test that warpExposure matches swarp using a lanczos2 warping kernel
-        """
-        self.compareToSwarp("lanczos4", useWarpExposure=False)
+        originalExposure = self._getOriginalExposure()
+        originalSkyWcs = self._originalSkyWcs
 
-    def testMatchSwarpLanczos4(self):
-        """Test that warpExposure matches swarp using a lanczos4 warping kernel.
-        """
-        self.compareToSwarp("lanczos4", useWarpExposure=True)
+        swarpedImage, warpedSkyWcs = readSwarpedImage(kernelName)
 
-    def testMatchSwarpNearestExposure(self):
-        """Test that warpExposure matches swarp using a nearest neighbor warping kernel
-        """
-        self.compareToSwarp("nearest", useWarpExposure=True, atol=60)
+        # original image is source, warped image is destination
+        srcToDest = afwGeom.makeWcsPairTransform(originalSkyWcs, warpedSkyWcs)
+        originalMaskedImage = originalExposure.getMaskedImage()
 
-    @unittest.skipIf(afwdataDir is None, "afwdata not setup")
-    def testTransformBasedWarp(self):
-        """Test warping using TransformPoint2ToPoint2
-        """
+        # reused for every interpLength, as all the warps have the same shape
+        noDataMaskArr = np.empty((swarpedImage.getHeight(), swarpedImage.getWidth()), dtype=bool)
         for interpLength in (0, 1, 2, 4):
-            kernelName = "lanczos3"
-            rtol = 4e-5
-            atol = 1e-2
             warpingControl = afwMath.WarpingControl(
                 warpingKernelName=kernelName,
                 interpLength=interpLength,
             )
 
-            originalExposure = afwImage.ExposureF(originalExposurePath)
-            originalMetadata = afwImage.DecoratedImageF(originalExposurePath).getMetadata()
-            originalSkyWcs = afwGeom.makeSkyWcs(originalMetadata)
-
-            swarpedImageName = f"medswarp1{kernelName}.fits"
-            swarpedImagePath = os.path.join(dataDir, swarpedImageName)
-            swarpedDecoratedImage = afwImage.DecoratedImageF(swarpedImagePath)
-            swarpedImage = swarpedDecoratedImage.getImage()
-
-            swarpedMetadata = swarpedDecoratedImage.getMetadata()
-            warpedSkyWcs = afwGeom.makeSkyWcs(swarpedMetadata)
-
-            # original image is source, warped image is destination
-            srcToDest = afwGeom.makeWcsPairTransform(originalSkyWcs, warpedSkyWcs)
-
             afwWarpedMaskedImage = afwImage.MaskedImageF(swarpedImage.getDimensions())
-            originalMaskedImage = originalExposure.getMaskedImage()
 
             numGoodPix = afwMath.warpImage(afwWarpedMaskedImage, originalMaskedImage,
                                            srcToDest, warpingControl)
@@ -383,25 +432,17 @@ class WarpExposureTestCase(lsst.utils.tests.TestCase):
 
             afwWarpedImage = afwWarpedMaskedImage.getImage()
             afwWarpedImageArr = afwWarpedImage.getArray()
-            noDataMaskArr = np.isnan(afwWarpedImageArr)
+            np.isnan(afwWarpedImageArr, out=noDataMaskArr)
             self.assertImagesAlmostEqual(afwWarpedImage, swarpedImage,
                                          skipMask=noDataMaskArr, rtol=rtol, atol=atol)
 
     def testTicket2441(self):
         """Test ticket 2441: warpExposure sometimes mishandles zero-extent dest exposures"""
-        fromWcs = afwGeom.makeSkyWcs(
-            crpix=lsst.geom.Point2D(0, 0),
-            crval=lsst.geom.SpherePoint(359, 0, lsst.geom.degrees),
-            cdMatrix=afwGeom.makeCdMatrix(scale=1.0e-8*lsst.geom.degrees),
-        )
+        fromWcs = makeSimpleSkyWcs(crpix=(0, 0), crval=(359, 0), scale=1.0e-8)
         fromExp = afwImage.ExposureF(afwImage.MaskedImageF(10, 10), fromWcs)
 
-        toWcs = afwGeom.makeSkyWcs(
-            crpix=lsst.geom.Point2D(410000, 11441),
-            crval=lsst.geom.SpherePoint(45, 0, lsst.geom.degrees),
-            cdMatrix=afwGeom.makeCdMatrix(scale=0.00011*lsst.geom.degrees, flipX=True),
-            projection="CEA",
-        )
+        toWcs = makeSimpleSkyWcs(crpix=(410000, 11441), crval=(45, 0), scale=0.00011, flipX=True,
+                                 projection="CEA")
         toExp = afwImage.ExposureF(afwImage.MaskedImageF(0, 0), toWcs)
 
         warpControl = afwMath.WarpingControl("lanczos3")
@@ -432,18 +473,10 @@ class WarpExposureTestCase(lsst.utils.tests.TestCase):
 
         This tests another bug that was fixed in ticket #2441
         """
-        fromWcs = afwGeom.makeSkyWcs(
-            crpix=lsst.geom.Point2D(0, 0),
-            crval=lsst.geom.SpherePoint(359, 0, lsst.geom.degrees),
-            cdMatrix=afwGeom.makeCdMatrix(scale=1.0e-8*lsst.geom.degrees),
-        )
+        fromWcs = makeSimpleSkyWcs(crpix=(0, 0), crval=(359, 0), scale=1.0e-8)
         fromExp = afwImage.ExposureF(afwImage.MaskedImageF(1, 1), fromWcs)
 
-        toWcs = afwGeom.makeSkyWcs(
-            crpix=lsst.geom.Point2D(0, 0),
-            crval=lsst.geom.SpherePoint(358, 0, lsst.geom.degrees),
-            cdMatrix=afwGeom.makeCdMatrix(scale=1.1e-8*lsst.geom.degrees),
-        )
+        toWcs = makeSimpleSkyWcs(crpix=(0, 0), crval=(358, 0), scale=1.1e-8)
         toExp = afwImage.ExposureF(afwImage.MaskedImageF(10, 10), toWcs)
 
         warpControl = afwMath.WarpingControl("lanczos3")
@@ -472,26 +505,21 @@ class WarpExposureTestCase(lsst.utils.tests.TestCase):
         - rtol: relative tolerance as used by np.allclose
         - atol: absolute tolerance as used by np.allclose
         """
-        srcWcs = afwGeom.makeSkyWcs(
-            crpix=lsst.geom.Point2D(10, 11),
-            crval=lsst.geom.SpherePoint(41.7, 32.9, lsst.geom.degrees),
-            cdMatrix=afwGeom.makeCdMatrix(scale=0.2*lsst.geom.degrees),
-        )
-        destWcs = afwGeom.makeSkyWcs(
-            crpix=lsst.geom.Point2D(9, 10),
-            crval=lsst.geom.SpherePoint(41.65, 32.95, lsst.geom.degrees),
-            cdMatrix=afwGeom.makeCdMatrix(scale=0.17*lsst.geom.degrees),
-        )
+        srcWcs = makeSimpleSkyWcs(crpix=(10, 11), crval=(41.7, 32.9), scale=0.2)
+        destWcs = makeSimpleSkyWcs(crpix=(9, 10), crval=(41.65, 32.95), scale=0.17)
 
         srcMaskedImage = afwImage.MaskedImageF(100, 101)
         srcExposure = afwImage.ExposureF(srcMaskedImage, srcWcs)
 
+        # Fill the source planes in place rather than assigning temporaries
         srcArrays = srcMaskedImage.getArrays()
-        shape = srcArrays[0].shape
-        srcArrays[0][:] = np.random.normal(10000, 1000, size=shape)
-        srcArrays[2][:] = np.random.normal(9000, 900, size=shape)
-        srcArrays[1][:] = np.reshape(
-            np.arange(0, shape[0] * shape[1], 1, dtype=np.uint16), shape)
+        self.rng.standard_normal(dtype=np.float32, out=srcArrays[0])
+        srcArrays[0] *= 1000
+        srcArrays[0] += 10000
+        self.rng.standard_normal(dtype=np.float32, out=srcArrays[2])
+        srcArrays[2] *= 900
+        srcArrays[2] += 9000
+        srcArrays[1][:] = self._maskRamp
 
         warpControl = afwMath.WarpingControl(
             kernelName,
@@ -522,8 +550,13 @@ class WarpExposureTestCase(lsst.utils.tests.TestCase):
             if np.all(narrowArrays[1] == broadArrays[1]):
                 self.fail("No difference between broad and narrow mask")
 
-        predMask = (broadArrays[1] & growFullMask) | (
-            narrowArrays[1] & ~growFullMask).astype(np.uint16)
+        # Combine the planes in the mask's own pixel type, without widening
+        maskPixel = broadArrays[1].dtype.type
+        predMask = broadArrays[1] & maskPixel(growFullMask)
+        # narrowArrays views narrowExposure, a throwaway that is never used
+        # again, so its mask can be overwritten with the masked-off bits
+        np.bitwise_and(narrowArrays[1], maskPixel(~growFullMask), out=narrowArrays[1])
+        predMask |= narrowArrays[1]
         predArraySet = (broadArrays[0], predMask, broadArrays[2])
         predExposure = afwImage.makeMaskedImageFromArrays(*predArraySet)
 
@@ -564,22 +597,16 @@ class WarpExposureTestCase(lsst.utils.tests.TestCase):
             interpLength,
         )
         if useSubregion:
-            originalFullExposure = afwImage.ExposureF(originalExposurePath)
+            originalFullExposure = self._getOriginalExposure()
             # "medsub" is a subregion of med starting at 0-indexed pixel (40, 150) of size 145 x 200
             bbox = lsst.geom.Box2I(lsst.geom.Point2I(40, 150),
                                    lsst.geom.Extent2I(145, 200))
             originalExposure = afwImage.ExposureF(
                 originalFullExposure, bbox, afwImage.LOCAL, useDeepCopy)
-            swarpedImageName = f"medsubswarp1{kernelName}.fits"
         else:
-            originalExposure = afwImage.ExposureF(originalExposurePath)
-            swarpedImageName = f"medswarp1{kernelName}.fits"
+            originalExposure = self._getOriginalExposure()
 
-        swarpedImagePath = os.path.join(dataDir, swarpedImageName)
-        swarpedDecoratedImage = afwImage.DecoratedImageF(swarpedImagePath)
-        swarpedImage = swarpedDecoratedImage.getImage()
-        swarpedMetadata = swarpedDecoratedImage.getMetadata()
-        warpedWcs = afwGeom.makeSkyWcs(swarpedMetadata)
+        swarpedImage, warpedWcs = readSwarpedImage(kernelName, useSubregion)
 
         if useWarpExposure:
             # path for saved afw-warped image
@@ -648,6 +675,11 @@ class WarpExposureTestCase(lsst.utils.tests.TestCase):
             srcToDest = afwGeom.makeWcsPairTransform(originalWcs, warpedWcs)
             afwMath.warpImage(afwWarpedImage2, originalImage,
                               srcToDest, warpingControl)
+            # Both images are ours, so NaNs (no data) must match; the usual case
+            # passes np.allclose and skips assertImagesAlmostEqual's diagnostics
+            if np.allclose(afwWarpedImage2.array, afwWarpedImage.array,
+                           rtol=rtol, atol=atol, equal_nan=True):
+                return
             msg = f"afw transform-based and WCS-based {kernelName}-warped images do not match"
             try:
                 self.assertImagesAlmostEqual(afwWarpedImage2, afwWarpedImage,
@@ -655,7 +687,7 @@ class WarpExposureTestCase(lsst.utils.tests.TestCase):
             except Exception:
                 if SAVE_FAILED_FITS_FILES:
                     # save the image anyway
-                    afwWarpedImage.writeFits(afwWarpedImage2)
+                    afwWarpedImage2.writeFits(afwWarpedImage2Path)
                     print(f"Saved failed afw-warped image as: {afwWarpedImage2Path}")
                 raise
 
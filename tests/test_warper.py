@@ -21,9 +21,12 @@
 #
 """Basic test of Warp (the warping algorithm is thoroughly tested in lsst.afw.math)
 """
+import functools
 import os
 import unittest
 
+import numpy as np
+
 import lsst.utils
 import lsst.utils.tests
 import lsst.geom
@@ -36,8 +39,10 @@ from lsst.log import Log
 
 # Change the level to Log.DEBUG to see debug messages
 Log.getLogger("afw.image.Mask").setLevel(Log.INFO)
-Log.getLogger("TRACE3.afw.math.warp").setLevel(Log.INFO)
-Log.getLogger("TRACE4.afw.math.warp").setLevel(Log.INFO)
+Log.getLogger("TRACE3.afw.math.warp").setLevel(Log.ERROR)
+Log.getLogger("TRACE4.afw.math.warp").setLevel(Log.ERROR)
+
+_NO_DATA_BITMASK = afwImage.Mask.getPlaneBitMask("NO_DATA")
 
 try:
     afwdataDir = lsst.utils.getPackageDir("afwdata")
@@ -55,10 +60,55 @@ else:
     originalFullExposurePath = os.path.join(dataDir, originalFullExposureName)
 
 
+@functools.lru_cache(maxsize=None)
+def getWarper(kernelName, interpLength=None, cacheSize=None):
+    """Return a Warper, built once per distinct set of arguments.
+
+    Warper does not change its WarpingControl when warping, so one instance
+    (including its kernel cache) can be shared by all tests.
+    ``interpLength`` and ``cacheSize`` are only passed to Warper if not None,
+    so by default it keeps its own settings.
+    """
+    kwargs = {}
+    if interpLength is not None:
+        kwargs["interpLength"] = interpLength
+    if cacheSize is not None:
+        kwargs["cacheSize"] = cacheSize
+    return afwMath.Warper(kernelName, **kwargs)
+
+
+@functools.lru_cache(maxsize=None)
+def readSwarpedImage(kernelName, useSubregion=False):
+    """Return the shared (read-only) swarped image and its WCS for a kernel.
+
+    This is a copy of readSwarpedImage in test_warpExposure.py; keep the two
+    in step.
+    """
+    prefix = "medsubswarp1" if useSubregion else "medswarp1"
+    swarpedImagePath = os.path.join(dataDir, f"{prefix}{kernelName}.fits")
+    swarpedDecoratedImage = afwImage.DecoratedImageF(swarpedImagePath)
+    swarpedImage = swarpedDecoratedImage.getImage()
+    swarpedWcs = afwGeom.makeSkyWcs(swarpedDecoratedImage.getMetadata())
+    return swarpedImage, swarpedWcs
+
+
 class WarpExposureTestCase(lsst.utils.tests.TestCase):
     """Test case for Warp
     """
 
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        if dataDir is not None:
+            # getSwarpedImage hands out copies or subimages of this
+            cls._originalExposure = afwImage.ExposureF(originalExposurePath)
+
+    @classmethod
+    def tearDownClass(cls):
+        if dataDir is not None:
+            del cls._originalExposure
+        super().tearDownClass()
+
     def testMatchSwarpLanczos2Exposure(self):
         """Test that warpExposure matches swarp using a lanczos2 warping kernel.
         """
@@ -76,7 +126,7 @@ class WarpExposureTestCase(lsst.utils.tests.TestCase):
         """Test that the default bounding box includes all warped pixels
         """
         kernelName = "lanczos2"
-        warper = afwMath.Warper(kernelName)
+        warper = getWarper(kernelName)
         originalExposure, swarpedImage, swarpedWcs = self.getSwarpedImage(
             kernelName=kernelName, useSubregion=True, useDeepCopy=False)
 
@@ -99,13 +149,9 @@ class WarpExposureTestCase(lsst.utils.tests.TestCase):
             destWcs=swarpedWcs, srcExposure=originalExposure, border=-10)
         # assert that warpedExposure and warpedExposure2 have the same number of non-no_data pixels
         # and that warpedExposure3 has fewer
-        noDataBitMask = afwImage.Mask.getPlaneBitMask("NO_DATA")
-        mask1Arr = warpedExposure1.getMaskedImage().getMask().getArray()
-        mask2Arr = warpedExposure2.getMaskedImage().getMask().getArray()
-        mask3Arr = warpedExposure3.getMaskedImage().getMask().getArray()
-        nGood1 = (mask1Arr & noDataBitMask == 0).sum()
-        nGood2 = (mask2Arr & noDataBitMask == 0).sum()
-        nGood3 = (mask3Arr & noDataBitMask == 0).sum()
+        nGood1 = self._countUnmaskedPixels(warpedExposure1, _NO_DATA_BITMASK)
+        nGood2 = self._countUnmaskedPixels(warpedExposure2, _NO_DATA_BITMASK)
+        nGood3 = self._countUnmaskedPixels(warpedExposure3, _NO_DATA_BITMASK)
         self.assertEqual(nGood1, nGood2)
         self.assertLess(nGood3, nGood1)
 
@@ -113,12 +159,18 @@ class WarpExposureTestCase(lsst.utils.tests.TestCase):
                          originalFilter.getName())
         self.assertEqual(warpedExposure1.getPhotoCalib(), originalPhotoCalib)
 
+    def _countUnmaskedPixels(self, exposure, bitMask):
+        """Return the number of pixels of ``exposure`` with none of ``bitMask`` set
+        """
+        maskArr = exposure.mask.array
+        return maskArr.size - np.count_nonzero(maskArr & bitMask)
+
     @unittest.skipIf(dataDir is None, "afwdata not setup")
     def testDestBBox(self):
         """Test that the destBBox argument works
         """
         kernelName = "lanczos2"
-        warper = afwMath.Warper(kernelName)
+        warper = getWarper(kernelName)
         originalExposure, swarpedImage, swarpedWcs = self.getSwarpedImage(
             kernelName=kernelName, useSubregion=True, useDeepCopy=False)
 
@@ -146,27 +198,21 @@ class WarpExposureTestCase(lsst.utils.tests.TestCase):
             else it is a shallow copy; ignored if useSubregion is False
 
         Returns:
-        - originalExposure
-        - swarpedImage
+        - originalExposure: has its own ExposureInfo, but unless it is a deep-copied
+            subregion it shares pixels with the cached medexp.fits, so they must not be written
+        - swarpedImage: shared between tests, so must not be modified
         - swarpedWcs
         """
         if useSubregion:
-            originalFullExposure = afwImage.ExposureF(originalExposurePath)
             # "medsub" is a subregion of med starting at 0-indexed pixel (40, 150) of size 145 x 200
             bbox = lsst.geom.Box2I(lsst.geom.Point2I(40, 150),
                                    lsst.geom.Extent2I(145, 200))
             originalExposure = afwImage.ExposureF(
-                originalFullExposure, bbox, afwImage.LOCAL, useDeepCopy)
-            swarpedImageName = f"medsubswarp1{kernelName}.fits"
+                self._originalExposure, bbox, afwImage.LOCAL, useDeepCopy)
         else:
-            originalExposure = afwImage.ExposureF(originalExposurePath)
-            swarpedImageName = f"medswarp1{kernelName}.fits"
-
-        swarpedImagePath = os.path.join(dataDir, swarpedImageName)
-        swarpedDecoratedImage = afwImage.DecoratedImageF(swarpedImagePath)
-        swarpedImage = swarpedDecoratedImage.getImage()
-        swarpedMetadata = swarpedDecoratedImage.getMetadata()
-        swarpedWcs = afwGeom.makeSkyWcs(swarpedMetadata)
+            originalExposure = afwImage.ExposureF(self._originalExposure, False)
+
+        swarpedImage, swarpedWcs = readSwarpedImage(kernelName, useSubregion)
         return (originalExposure, swarpedImage, swarpedWcs)
 
     @unittest.skipIf(dataDir is None, "afwdata not setup")
@@ -192,7 +238,7 @@ class WarpExposureTestCase(lsst.utils.tests.TestCase):
         - rtol: relative tolerance as used by numpy.allclose
         - atol: absolute tolerance as used by numpy.allclose
         """
-        warper = afwMath.Warper(kernelName)
+        warper = getWarper(kernelName, interpLength=interpLength, cacheSize=cacheSize)
 
         originalExposure, swarpedImage, swarpedWcs = self.getSwarpedImage(
             kernelName=kernelName, useSubregion=useSubregion, useDeepCopy=useDeepCopy)
@@ -210,8 +256,7 @@ class WarpExposureTestCase(lsst.utils.tests.TestCase):
         afwWarpedMaskedImage = afwWarpedExposure.getMaskedImage()
 
         afwWarpedMask = afwWarpedMaskedImage.getMask()
-        noDataBitMask = afwImage.Mask.getPlaneBitMask("NO_DATA")
-        noDataMask = afwWarpedMask.getArray() & noDataBitMask
+        noDataMask = (afwWarpedMask.getArray() & _NO_DATA_BITMASK).astype(bool)
 
         msg = "afw and swarp %s-warped %s (ignoring bad pixels)"
         self.assertImagesAlmostEqual(afwWarpedMaskedImage.getImage(), swarpedImage,